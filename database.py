@@ -16,6 +16,10 @@ def create_database_schema(db_name='scopus_database.db'):
 
         # Drop tables in reverse order of foreign key dependencies for clean re-runs during development
         # This is useful for resetting the database during development, but be cautious in production.
+        # The FTS tables index the content tables by rowid, so they must go
+        # first or a re-run would keep a stale full-text index around
+        cursor.execute("DROP TABLE IF EXISTS articles_fts")
+        cursor.execute("DROP TABLE IF EXISTS authors_fts")
         cursor.execute("DROP TABLE IF EXISTS article_authors")
         cursor.execute("DROP TABLE IF EXISTS author_affiliations")
         cursor.execute("DROP TABLE IF EXISTS authors")
@@ -39,10 +43,13 @@ def create_database_schema(db_name='scopus_database.db'):
         print("Table 'articles' created.")
 
         # Create Authors Table based on project requirements (full name, Scopus Author ID, ORCID)
+        # Uniqueness of scopus_author_id is enforced by an index created after
+        # the bulk load (see create_post_load_indexes) so inserts don't pay
+        # per-row btree maintenance.
         cursor.execute('''
         CREATE TABLE authors (
             author_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            scopus_author_id TEXT UNIQUE, -- @auid (can be NULL if not available from API)
+            scopus_author_id TEXT,       -- @auid (can be NULL if not available from API)
             full_name TEXT,              -- preferred-name
             orcid TEXT                   -- ORCID (si disponible)
         )
@@ -53,7 +60,7 @@ def create_database_schema(db_name='scopus_database.db'):
         cursor.execute('''
         CREATE TABLE affiliations (
             affiliation_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            scopus_affiliation_id TEXT UNIQUE, -- Identifiant Affiliation Scopus (can be NULL)
+            scopus_affiliation_id TEXT,        -- Identifiant Affiliation Scopus (can be NULL)
             institution_name TEXT,             -- Nom de l'institution
             country TEXT                       -- Pays
         )
@@ -98,5 +105,78 @@ def create_database_schema(db_name='scopus_database.db'):
             conn.close()
             print("Database connection closed.")
 
+def create_post_load_indexes(db_name='scopus_database.db'):
+    """
+    Creates the unique and lookup indexes once, after the bulk load.
+
+    Building btrees over the finished tables is far cheaper than maintaining
+    them row by row during millions of inserts — the standard SQLite
+    bulk-load pattern.
+    """
+    conn = None
+    try:
+        conn = sqlite3.connect(db_name)
+        cursor = conn.cursor()
+        print(f"Creating post-load indexes in: {db_name}")
+
+        # Uniqueness deferred from the schema (partial: NULL ids are allowed)
+        cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_authors_scopus
+        ON authors(scopus_author_id) WHERE scopus_author_id IS NOT NULL
+        ''')
+        cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_affiliations_scopus
+        ON affiliations(scopus_affiliation_id) WHERE scopus_affiliation_id IS NOT NULL
+        ''')
+
+        # Lookup indexes for the chatbot's filter paths (same names the app
+        # creates on demand, so neither side duplicates the other's work)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_article_authors_article ON article_authors(article_scopus_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_author_affiliations_author ON author_affiliations(author_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_affiliations_country ON affiliations(country)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_affiliations_institution ON affiliations(institution_name)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_authors_full_name ON authors(full_name)")
+
+        # Full-text index over articles/authors so the chatbot's keyword and
+        # author lookups hit an inverted index instead of LIKE scans. Same
+        # external-content definitions the app creates on demand, so either
+        # side can build them first. FTS5 may be compiled out of sqlite.
+        try:
+            cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+                title, abstract, keywords,
+                content='articles', content_rowid='rowid'
+            )
+            ''')
+            cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS authors_fts USING fts5(
+                full_name,
+                content='authors', content_rowid='author_id'
+            )
+            ''')
+            # Plain count(*) on an external-content table reads the content
+            # table, not the index, so gate on the docsize shadow table and
+            # let FTS5's own 'rebuild' command index everything
+            if cursor.execute("SELECT count(*) FROM articles_fts_docsize").fetchone()[0] == 0:
+                cursor.execute("INSERT INTO articles_fts(articles_fts) VALUES('rebuild')")
+            if cursor.execute("SELECT count(*) FROM authors_fts_docsize").fetchone()[0] == 0:
+                cursor.execute("INSERT INTO authors_fts(authors_fts) VALUES('rebuild')")
+            print("FTS5 tables created and populated.")
+        except sqlite3.OperationalError as e:
+            print(f"FTS5 unavailable, skipping full-text tables: {e}")
+
+        # Refresh planner statistics now that the data and indexes exist
+        cursor.execute("ANALYZE")
+        cursor.execute("PRAGMA optimize")
+
+        conn.commit()
+        print("Post-load indexes created successfully.")
+
+    except sqlite3.Error as e:
+        print(f"SQLite error: {e}")
+    finally:
+        if conn:
+            conn.close()
+
 if __name__ == "__main__":
     create_database_schema()
\ No newline at end of file
@@ -1,5 +1,10 @@
+import hashlib
+import itertools
+import pickle
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from sentence_transformers import SentenceTransformer
+import torch
 import faiss
 import numpy as np
 import json
@@ -7,6 +12,30 @@ import os
 
 DATABASE_NAME = 'scopus_database.db'
 
+# Quantized ONNX export of SPECTER, produced by convert_model.py
+ONNX_MODEL_DIR = 'specter_onnx'
+ONNX_MODEL_FILE = os.path.join(ONNX_MODEL_DIR, 'model_int8.onnx')
+
+# Persistent embedding cache so reruns only encode new/changed texts
+EMBEDDING_CACHE_FILE = 'embedding_cache.npy'
+EMBEDDING_CACHE_KEYS_FILE = 'embedding_cache_keys.json'
+
+# The auxiliary encoder gets its own cache files — its embeddings have a
+# different width than SPECTER's, and one cache holds a single matrix
+AUX_EMBEDDING_CACHE_FILE = 'embedding_cache_minilm.npy'
+AUX_EMBEDDING_CACHE_KEYS_FILE = 'embedding_cache_minilm_keys.json'
+
+# Only the content index does precise semantic ranking, so only it pays for
+# SPECTER. The filter-oriented indexes are built with a ~5x faster MiniLM
+# (384-D); the app routes their queries to the same model.
+SPECTER_INDEX_TYPES = {'content'}
+AUX_MODEL_NAME = 'sentence-transformers/all-MiniLM-L6-v2'
+
+# These index types serve filtering rather than precise ranking, so they use
+# 1-bit binary quantization: 32x smaller than float32, and Hamming distance
+# via popcnt is much cheaper than float dot products
+BINARY_INDEX_TYPES = {'metadata', 'institution'}
+
 # Multiple FAISS indexes for different search types
 INDEXES = {
     'content': {
@@ -32,130 +61,293 @@ INDEXES = {
 }
 
 def get_article_data_with_affiliations():
-    """Get articles with their affiliation information."""
+    """Stream articles with their affiliation information.
+
+    The old one-shot query LEFT JOINed four tables with three
+    GROUP_CONCATs, materializing authors x affiliations rows per article
+    (and a temp sort) before collapsing them. Two flat relation queries
+    grouped into dicts plus a streamed scan of articles produce the same
+    rows with O(N + relation rows) I/O.
+    """
     conn = sqlite3.connect(DATABASE_NAME)
     cursor = conn.cursor()
-    
-    # Extended query to include affiliations and countries
-    cursor.execute('''
-        SELECT 
-            A.scopus_id, 
-            A.title, 
-            A.abstract, 
-            A.cover_date, 
-            A.keywords,
-            GROUP_CONCAT(Auth.full_name, '; ') AS authors_list,
-            GROUP_CONCAT(Aff.institution_name, '; ') AS affiliations_list,
-            GROUP_CONCAT(Aff.country, '; ') AS countries_list
-        FROM articles AS A
-        LEFT JOIN article_authors AS AA ON A.scopus_id = AA.article_scopus_id
-        LEFT JOIN authors AS Auth ON AA.author_id = Auth.author_id
-        LEFT JOIN author_affiliations AS AuthAff ON Auth.author_id = AuthAff.author_id
-        LEFT JOIN affiliations AS Aff ON AuthAff.affiliation_id = Aff.affiliation_id
-        WHERE A.abstract IS NOT NULL AND A.abstract != '' 
-        GROUP BY A.scopus_id, A.title, A.abstract, A.cover_date, A.keywords
-        ORDER BY A.scopus_id
-    ''')
-    
-    articles_data = cursor.fetchall()
-    conn.close()
-    return articles_data
 
-def create_embeddings_for_index_type(articles_data, index_type):
-    """Create embeddings based on index type."""
-    texts_to_embed = []
+    try:
+        authors_by_article = {}
+        cursor.execute('''
+            SELECT AA.article_scopus_id, Auth.full_name
+            FROM article_authors AS AA
+            JOIN authors AS Auth ON AA.author_id = Auth.author_id
+        ''')
+        for article_id, full_name in cursor.fetchall():
+            authors_by_article.setdefault(article_id, []).append(full_name)
+
+        institutions_by_article = {}
+        countries_by_article = {}
+        cursor.execute('''
+            SELECT DISTINCT AA.article_scopus_id, Aff.institution_name, Aff.country
+            FROM article_authors AS AA
+            JOIN author_affiliations AS AuthAff ON AA.author_id = AuthAff.author_id
+            JOIN affiliations AS Aff ON AuthAff.affiliation_id = Aff.affiliation_id
+        ''')
+        for article_id, institution_name, country in cursor.fetchall():
+            if institution_name:
+                institutions_by_article.setdefault(article_id, []).append(institution_name)
+            if country:
+                countries_by_article.setdefault(article_id, []).append(country)
+
+        cursor.execute('''
+            SELECT scopus_id, title, abstract, cover_date, keywords
+            FROM articles
+            WHERE abstract IS NOT NULL AND abstract != ''
+            ORDER BY scopus_id
+        ''')
+        while True:
+            rows = cursor.fetchmany(1024)
+            if not rows:
+                break
+            for scopus_id, title, abstract, cover_date, keywords in rows:
+                authors = authors_by_article.get(scopus_id)
+                institutions = institutions_by_article.get(scopus_id)
+                countries = countries_by_article.get(scopus_id)
+                yield (scopus_id, title, abstract, cover_date, keywords,
+                       '; '.join(authors) if authors else None,
+                       '; '.join(institutions) if institutions else None,
+                       '; '.join(countries) if countries else None)
+    finally:
+        conn.close()
+
+# Each index type is a weighted mean of component embeddings. Averaging
+# L2-normalized sentence embeddings is the standard SBERT composition and
+# preserves cosine semantics, so every component is encoded exactly once
+# instead of re-encoding its text inside four different concatenations.
+INDEX_COMPONENT_WEIGHTS = {
+    'content':     {'title': 1.0, 'abstract': 1.0},
+    'metadata':    {'title': 1.0, 'abstract': 1.0, 'keywords': 0.5, 'authors': 0.5},
+    'institution': {'affiliations': 1.0, 'countries': 1.0, 'title': 0.5},
+    'full':        {'title': 1.0, 'abstract': 1.0, 'keywords': 0.5, 'authors': 0.5,
+                    'affiliations': 0.5, 'countries': 0.5}
+}
+
+def _text_cache_key(text):
+    # blake2b is much faster than sha256 and 16 bytes is plenty for a cache key
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+class DiskEmbeddingCache:
+    """Persistent text-hash -> embedding cache across indexing runs.
+
+    Reruns after incremental data pulls only pay the encoder for new or
+    changed texts; everything else is stitched in from the .npy on disk.
+    """
+
+    def __init__(self, matrix_file=EMBEDDING_CACHE_FILE, keys_file=EMBEDDING_CACHE_KEYS_FILE):
+        self.matrix_file = matrix_file
+        self.keys_file = keys_file
+        self._base = None
+        self._positions = {}
+        self._new_rows = []
+
+        try:
+            if os.path.exists(matrix_file) and os.path.exists(keys_file):
+                self._base = np.load(matrix_file)
+                with open(keys_file, 'r', encoding='utf-8') as f:
+                    keys = json.load(f)
+                self._positions = {key: i for i, key in enumerate(keys)}
+                print(f"📦 Loaded embedding cache with {len(self._positions)} entries")
+        except Exception as e:
+            print(f"⚠️ Could not load embedding cache, starting fresh: {e}")
+            self.reset()
+
+    def _base_len(self):
+        return 0 if self._base is None else len(self._base)
+
+    def lookup(self, key):
+        position = self._positions.get(key)
+        if position is None:
+            return None
+        if position < self._base_len():
+            return self._base[position]
+        return self._new_rows[position - self._base_len()]
+
+    def store(self, key, row):
+        if key in self._positions:
+            return
+        self._positions[key] = self._base_len() + len(self._new_rows)
+        self._new_rows.append(np.asarray(row, dtype='float32'))
+
+    def reset(self):
+        self._base = None
+        self._positions = {}
+        self._new_rows = []
+
+    def save(self):
+        if not self._new_rows:
+            return
+        parts = ([self._base] if self._base is not None else []) + [np.stack(self._new_rows)]
+        matrix = np.concatenate(parts) if len(parts) > 1 else parts[0]
+        keys = sorted(self._positions, key=self._positions.get)
+        np.save(self.matrix_file, matrix)
+        with open(self.keys_file, 'w', encoding='utf-8') as f:
+            json.dump(keys, f)
+        print(f"💾 Saved embedding cache ({len(keys)} entries)")
+
+def encode_texts_cached(texts, model, cache):
+    """encode_texts with the persistent content-hash cache in front."""
+    keys = [_text_cache_key(text) for text in texts]
+    cached = [cache.lookup(key) for key in keys]
+
+    miss_positions = [i for i, row in enumerate(cached) if row is None]
+    if miss_positions:
+        encoded = encode_texts([texts[i] for i in miss_positions], model)
+
+        # A model change (different output width) invalidates the cache
+        if any(row is not None and row.shape[0] != encoded.shape[1] for row in cached):
+            print("⚠️ Embedding cache dimension mismatch, re-encoding from scratch")
+            cache.reset()
+            cached = [None] * len(texts)
+            miss_positions = list(range(len(texts)))
+            encoded = encode_texts(texts, model)
+
+        for row_idx, position in enumerate(miss_positions):
+            cached[position] = encoded[row_idx]
+            cache.store(keys[position], encoded[row_idx])
+
+    return np.stack(cached).astype('float32', copy=False)
+
+def build_component_texts(articles_data):
+    """Build the unique component text lists, one entry per article.
+
+    Processes blocks of rows column-wise — one zip transpose plus a list
+    comprehension per component — instead of eight per-row method calls
+    and branches; the comprehensions run the formatting loop in C.
+    """
+    components = {'title': [], 'abstract': [], 'keywords': [],
+                  'authors': [], 'affiliations': [], 'countries': []}
     article_ids = []
-    
-    for row in articles_data:
-        scopus_id, title, abstract, cover_date, keywords, authors_list, affiliations_list, countries_list = row
-        
-        # Build text based on index type
-        if index_type == 'content':
-            # Primary content search (title + abstract only)
-            text = ""
-            if title:
-                text += f"{title}. "
-            if abstract:
-                text += f"{abstract}"
-                
-        elif index_type == 'metadata':
-            # Content + metadata
-            text = ""
-            if title:
-                text += f"{title}. "
-            if abstract:
-                text += f"{abstract}. "
-            if keywords:
-                text += f"Keywords: {keywords}. "
-            if authors_list and authors_list != 'None':
-                text += f"Authors: {authors_list}. "
-                
-        elif index_type == 'institution':
-            # Institution and country focused
-            text = ""
-            if affiliations_list and affiliations_list != 'None':
-                text += f"Institutions: {affiliations_list}. "
-            if countries_list and countries_list != 'None':
-                text += f"Countries: {countries_list}. "
-            # Add title for context
-            if title:
-                text += f"Title: {title}"
-                
-        elif index_type == 'full':
-            # Everything combined
-            text = ""
-            if title:
-                text += f"{title}. "
-            if abstract:
-                text += f"{abstract}. "
-            if keywords:
-                text += f"Keywords: {keywords}. "
-            if authors_list and authors_list != 'None':
-                text += f"Authors: {authors_list}. "
-            if affiliations_list and affiliations_list != 'None':
-                text += f"Institutions: {affiliations_list}. "
-            if countries_list and countries_list != 'None':
-                text += f"Countries: {countries_list}. "
-        
-        text = text.strip()
-        if text:  # Only add if we have text
-            texts_to_embed.append(text)
-            article_ids.append(scopus_id)
-    
-    return texts_to_embed, article_ids
-
-def build_faiss_index(texts, model):
-    """Build and return a FAISS index."""
-    print(f"Generating embeddings for {len(texts)} texts...")
-    embeddings = model.encode(texts, 
-                             batch_size=8,
-                             show_progress_bar=True,
-                             convert_to_numpy=True)
-    embeddings = embeddings.astype('float32')
-    
-    # Build FAISS index
-    dimension = embeddings.shape[1]
-    index = faiss.IndexFlatIP(dimension)  # Inner Product for cosine similarity
-    faiss.normalize_L2(embeddings)  # Normalize for cosine similarity
-    index.add(embeddings)
-    
-    return index, embeddings
+    rows_iter = iter(articles_data)
+
+    while True:
+        block = list(itertools.islice(rows_iter, 4096))
+        if not block:
+            break
+
+        (scopus_ids, titles, abstracts, _cover_dates, keywords_col,
+         authors_col, affiliations_col, countries_col) = zip(*block)
+
+        article_ids.extend(scopus_ids)
+        components['title'].extend(title or '' for title in titles)
+        components['abstract'].extend(abstract or '' for abstract in abstracts)
+        components['keywords'].extend(
+            f"Keywords: {kw}" if kw else '' for kw in keywords_col)
+        components['authors'].extend(
+            f"Authors: {a}" if a and a != 'None' else '' for a in authors_col)
+        components['affiliations'].extend(
+            f"Institutions: {a}" if a and a != 'None' else '' for a in affiliations_col)
+        components['countries'].extend(
+            f"Countries: {c}" if c and c != 'None' else '' for c in countries_col)
+
+    return components, article_ids
+
+def encode_components(components, model, cache=None):
+    """Encode each unique component once; articles missing it get zero rows."""
+    component_embeddings = {}
+
+    for name, texts in components.items():
+        nonempty = [i for i, text in enumerate(texts) if text]
+        if not nonempty:
+            component_embeddings[name] = None
+            continue
+
+        print(f"🧩 Encoding component '{name}' ({len(nonempty)} texts)...")
+        nonempty_texts = [texts[i] for i in nonempty]
+        if cache is not None:
+            encoded = encode_texts_cached(nonempty_texts, model, cache)
+        else:
+            encoded = encode_texts(nonempty_texts, model)
+
+        full = np.zeros((len(texts), encoded.shape[1]), dtype='float32')
+        full[nonempty] = encoded
+        component_embeddings[name] = full
+
+    return component_embeddings
+
+def combine_component_embeddings(component_embeddings, weights, article_ids):
+    """Weighted-mean the component embeddings into one matrix per index type.
+
+    Articles with none of the weighted components drop out, matching the old
+    behaviour of skipping articles whose built text was empty. Returns
+    (embeddings, kept_article_ids).
+    """
+    combined = None
+    for name, weight in weights.items():
+        embeddings = component_embeddings.get(name)
+        if embeddings is None:
+            continue
+        combined = weight * embeddings if combined is None else combined + weight * embeddings
+
+    if combined is None:
+        return None, []
+
+    norms = np.linalg.norm(combined, axis=1, keepdims=True)
+    keep = norms[:, 0] > 0
+    combined = combined[keep] / norms[keep]
+    kept_ids = [article_id for article_id, kept in zip(article_ids, keep) if kept]
+    return combined, kept_ids
+
+class OnnxEncoder:
+    """Drop-in .encode() replacement backed by an int8 ONNX Runtime session.
+
+    Bulk indexing is dominated by the transformer forward pass; int8 GEMMs
+    in ONNX Runtime give 2-4x the throughput of FP32 PyTorch on CPU.
+    """
+
+    def __init__(self, model_dir, model_file):
+        import onnxruntime
+        from transformers import AutoTokenizer
+
+        sess_options = onnxruntime.SessionOptions()
+        sess_options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        sess_options.intra_op_num_threads = os.cpu_count()
+
+        self.session = onnxruntime.InferenceSession(
+            model_file, sess_options, providers=['CPUExecutionProvider']
+        )
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def encode(self, sentences, batch_size=32, convert_to_numpy=True,
+               normalize_embeddings=False, **kwargs):
+        embeddings = []
+
+        for start in range(0, len(sentences), batch_size):
+            batch = sentences[start:start + batch_size]
+            encoded = self.tokenizer(batch, padding=True, truncation=True,
+                                     max_length=512, return_tensors='np')
+            feed = {k: v for k, v in encoded.items() if k in self.input_names}
+            token_embeddings = self.session.run(None, feed)[0]
+            # CLS-token pooling, matching SPECTER's sentence-transformers config
+            embeddings.append(token_embeddings[:, 0])
+
+        embeddings = np.concatenate(embeddings).astype('float32')
+        if normalize_embeddings:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings /= np.maximum(norms, 1e-12)
+        return embeddings
+
+def load_encoder():
+    """Load the fastest available SPECTER encoder, with fallbacks."""
+    # Prefer the int8 ONNX model when convert_model.py has been run
+    if os.path.exists(ONNX_MODEL_FILE):
+        try:
+            model = OnnxEncoder(ONNX_MODEL_DIR, ONNX_MODEL_FILE)
+            print("✅ Loaded int8 ONNX SPECTER model")
+            return model
+        except Exception as e:
+            print(f"⚠️ Could not load ONNX model, falling back to PyTorch: {e}")
+
+    # Default torch thread count is often 1; give the encode GEMMs every core
+    torch.set_num_threads(os.cpu_count())
 
-def perform_enhanced_semantic_indexing():
-    """Create multiple FAISS indexes for different search strategies."""
-    
-    print("🚀 Starting Enhanced Semantic Indexing...")
-    print("📊 Fetching articles with affiliation data...")
-    
-    articles_data = get_article_data_with_affiliations()
-    if not articles_data:
-        print("❌ No articles found!")
-        return
-    
-    print(f"✅ Found {len(articles_data)} articles to index")
-    
-    # Load SPECTER model
-    print("🧬 Loading SPECTER model...")
     try:
         model = SentenceTransformer('allenai/specter')
         print("✅ SPECTER loaded successfully!")
@@ -167,34 +359,220 @@ def perform_enhanced_semantic_indexing():
         except:
             model = SentenceTransformer('all-MiniLM-L6-v2')
             print("✅ Using MiniLM as last resort")
-    
-    # Create each index type
-    for index_type, config in INDEXES.items():
-        print(f"\n🔍 Creating {index_type} index: {config['description']}")
-        
-        # Prepare texts for this index type
-        texts, article_ids = create_embeddings_for_index_type(articles_data, index_type)
-        
-        if not texts:
-            print(f"⚠️ No texts found for {index_type} index")
-            continue
-            
-        print(f"📄 Processing {len(texts)} texts for {index_type} index")
-        
-        # Build FAISS index
-        index, embeddings = build_faiss_index(texts, model)
-        
-        # Save FAISS index
+
+    if torch.cuda.is_available():
+        # Transformer inference is bandwidth-bound on weights/activations,
+        # so fp16 roughly doubles GPU throughput. encode_texts casts the
+        # embeddings back to fp32 before they reach FAISS.
+        model = model.half()
+        print("✅ Running fp16 inference on GPU")
+
+    return model
+
+def load_aux_encoder():
+    """Load the small auxiliary encoder for the filter-oriented indexes.
+
+    Dynamic int8 quantization of the Linear layers roughly doubles MiniLM's
+    CPU throughput; it is skipped on CUDA where fp16 already applies.
+    Returns None when the model is unavailable, in which case everything
+    falls back to the main encoder.
+    """
+    try:
+        aux_model = SentenceTransformer(AUX_MODEL_NAME)
+    except Exception as e:
+        print(f"⚠️ Could not load {AUX_MODEL_NAME}, auxiliary indexes reuse the main model: {e}")
+        return None
+
+    if torch.cuda.is_available():
+        aux_model = aux_model.half()
+        print("✅ MiniLM loaded, fp16 on GPU")
+        return aux_model
+
+    try:
+        aux_model = torch.quantization.quantize_dynamic(
+            aux_model, {torch.nn.Linear}, dtype=torch.qint8)
+        print("✅ MiniLM loaded with int8 dynamic quantization")
+    except Exception as e:
+        print(f"✅ MiniLM loaded (int8 quantization unavailable: {e})")
+    return aux_model
+
+def scopus_id_to_int64(scopus_id):
+    """Stable 63-bit FAISS label derived from a scopus_id string."""
+    digest = hashlib.blake2b(str(scopus_id).encode('utf-8'), digest_size=8).hexdigest()
+    return int(digest, 16) & ((1 << 63) - 1)
+
+def build_binary_index_from_embeddings(embeddings, ids64):
+    """1-bit quantize normalized embeddings (sign per dimension) into a
+    Hamming-distance index."""
+    packed = np.packbits((embeddings > 0).astype(np.uint8), axis=1)
+    index = faiss.IndexBinaryIDMap(faiss.IndexBinaryFlat(embeddings.shape[1]))
+    index.add_with_ids(packed, ids64)
+    return index
+
+def build_index_from_embeddings(embeddings, ids64):
+    """Build a FAISS index: IVFPQ when the corpus can train it, else fp16 SQ.
+
+    A flat index scans all N x 768 floats per query; IVFPQ probes a few
+    clusters and stores PQ codes, cutting index RAM ~16-32x and comparisons
+    from N to roughly sqrt(N). Vectors are stored under their int64 scopus
+    labels so searches return the label directly.
+    """
+    num_vectors, dimension = embeddings.shape
+
+    # Rule of thumb: nlist ~ 4*sqrt(N); IVF training wants >= ~10 points/list
+    nlist = max(64, int(4 * np.sqrt(num_vectors)))
+    if num_vectors < 10 * nlist:
+        # Inner Product for cosine similarity, stored as fp16: halves index
+        # size and the bytes the distance kernel moves, with negligible
+        # recall loss on normalized vectors. Needs the IDMap2 wrapper.
+        sq = faiss.IndexScalarQuantizer(dimension, faiss.ScalarQuantizer.QT_fp16,
+                                        faiss.METRIC_INNER_PRODUCT)
+        sq.train(embeddings)
+        index = faiss.IndexIDMap2(sq)
+        index.add_with_ids(embeddings, ids64)
+        return index
+
+    m = dimension // 4  # PQ sub-quantizers (must divide the dimension)
+    quantizer = faiss.IndexFlatIP(dimension)
+    index = faiss.IndexIVFPQ(quantizer, dimension, nlist, m, 8, faiss.METRIC_INNER_PRODUCT)
+    index.train(embeddings)
+    index.add_with_ids(embeddings, ids64)  # IVF stores ids natively
+    index.nprobe = max(8, nlist // 32)
+    return index
+
+def encode_texts(texts, model, batch_size=32):
+    """Encode texts length-sorted so minibatches pad minimally.
+
+    Encoding in random order pads every minibatch to its longest sequence,
+    wasting transformer FLOPs on padding for mixes of short (institution)
+    and long (full) texts. Sorting by length first keeps each batch's
+    sequences similar; the original order is restored afterwards.
+    """
+    order = np.argsort([len(text) for text in texts])
+    embeddings = model.encode([texts[i] for i in order],
+                              batch_size=batch_size,
+                              show_progress_bar=True,
+                              convert_to_numpy=True,
+                              normalize_embeddings=True)
+    # Undo the sort and normalize dtype for FAISS in one pass
+    return embeddings[np.argsort(order)].astype('float32', copy=False)
+
+def spill_invlists_to_disk(index, faiss_file):
+    """Move an IVF index's inverted lists into an mmap-able sidecar file.
+
+    Only the coarse centroids then stay resident when the app loads the
+    index with IO_FLAG_MMAP; the lists for the nprobe probed clusters are
+    paged in per query. That keeps Scopus-scale indexes inside a Hugging
+    Face Space's RAM budget. The '.ivfdata' sidecar must ship next to the
+    index file.
+    """
+    try:
+        ivf = faiss.extract_index_ivf(index)
+    except (RuntimeError, TypeError):
+        return  # Flat index (small corpus), nothing to spill
+
+    on_disk = faiss.OnDiskInvertedLists(ivf.nlist, ivf.code_size, faiss_file + '.ivfdata')
+    on_disk.merge_from(ivf.invlists, 0)
+    ivf.replace_invlists(on_disk, True)
+
+def build_and_save_index(index_type, config, embeddings, kept_ids):
+    """Build one index and write it plus its id-map sidecar to disk."""
+    # The scopus_id rides inside the index as an int64 label; the small
+    # sidecar maps returned labels back to scopus_id strings
+    ids64 = np.array([scopus_id_to_int64(s) for s in kept_ids], dtype=np.int64)
+
+    # Build FAISS index (binary for the filter-oriented index types)
+    if index_type in BINARY_INDEX_TYPES:
+        index = build_binary_index_from_embeddings(embeddings, ids64)
+        faiss.write_index_binary(index, config['faiss_file'])
+    else:
+        index = build_index_from_embeddings(embeddings, ids64)
+        spill_invlists_to_disk(index, config['faiss_file'])
         faiss.write_index(index, config['faiss_file'])
-        print(f"💾 Saved FAISS index: {config['faiss_file']}")
-        
-        # Save article IDs mapping
-        with open(config['ids_file'], 'w') as f:
-            json.dump(article_ids, f)
-        print(f"💾 Saved article IDs: {config['ids_file']}")
-        
-        print(f"✅ {index_type} index complete: {len(article_ids)} articles, {embeddings.shape[1]} dimensions")
+    print(f"💾 Saved FAISS index: {config['faiss_file']}")
+
+    # Save the label -> scopus_id mapping (replaces the positional JSON)
+    id_map = {int(id64): scopus_id for id64, scopus_id in zip(ids64, kept_ids)}
+    with open(config['faiss_file'] + '.idmap.pkl', 'wb') as f:
+        pickle.dump(id_map, f, protocol=pickle.HIGHEST_PROTOCOL)
+    print(f"💾 Saved article ID map: {config['faiss_file']}.idmap.pkl")
+
+    print(f"✅ {index_type} index complete: {len(kept_ids)} articles, {embeddings.shape[1]} dimensions")
+
+def perform_enhanced_semantic_indexing():
+    """Create multiple FAISS indexes for different search strategies."""
     
+    print("🚀 Starting Enhanced Semantic Indexing...")
+
+    # Load SPECTER model (ONNX int8 when available, else PyTorch) for the
+    # content index, and the small MiniLM for the auxiliary indexes
+    print("🧬 Loading SPECTER model...")
+    model = load_encoder()
+    print("🧬 Loading auxiliary MiniLM model...")
+    aux_model = load_aux_encoder()
+
+    # Encode every unique component once, then combine per index type —
+    # title and abstract are shared by all four indexes, so this replaces
+    # four full re-encodes with one pass per component. The article rows
+    # stream straight from SQLite into the component lists.
+    print("📊 Fetching articles with affiliation data...")
+    components, article_ids = build_component_texts(get_article_data_with_affiliations())
+
+    if not article_ids:
+        print("❌ No articles found!")
+        return
+
+    print(f"✅ Found {len(article_ids)} articles to index")
+
+    # Only texts not already in the on-disk cache hit the encoder. SPECTER
+    # only encodes the components the content index needs; the auxiliary
+    # indexes get MiniLM embeddings of everything (or SPECTER's when MiniLM
+    # is unavailable).
+    specter_components = components
+    if aux_model is not None:
+        needed = set().union(*(INDEX_COMPONENT_WEIGHTS[t] for t in SPECTER_INDEX_TYPES))
+        specter_components = {name: components[name] for name in needed}
+
+    cache = DiskEmbeddingCache()
+    specter_embeddings = encode_components(specter_components, model, cache)
+    cache.save()
+
+    aux_embeddings = specter_embeddings
+    if aux_model is not None:
+        print("🧩 Encoding auxiliary-index components with MiniLM...")
+        aux_cache = DiskEmbeddingCache(AUX_EMBEDDING_CACHE_FILE, AUX_EMBEDDING_CACHE_KEYS_FILE)
+        aux_embeddings = encode_components(components, aux_model, aux_cache)
+        aux_cache.save()
+
+    # Create each index type. Building (IVF train/add) and writing release
+    # the GIL in FAISS's C++ code, so a single builder thread overlaps with
+    # the main thread combining the next index's embeddings; at most two
+    # combined matrices are in flight at once to bound peak memory.
+    with ThreadPoolExecutor(max_workers=1) as builder:
+        in_flight = []
+        for index_type, config in INDEXES.items():
+            print(f"\n🔍 Creating {index_type} index: {config['description']}")
+
+            component_embeddings = (specter_embeddings if index_type in SPECTER_INDEX_TYPES
+                                    else aux_embeddings)
+            embeddings, kept_ids = combine_component_embeddings(
+                component_embeddings, INDEX_COMPONENT_WEIGHTS[index_type], article_ids)
+
+            if embeddings is None or not len(embeddings):
+                print(f"⚠️ No texts found for {index_type} index")
+                continue
+
+            print(f"📄 Combining embeddings for {len(kept_ids)} articles in {index_type} index")
+
+            if len(in_flight) >= 2:
+                in_flight.pop(0).result()
+            in_flight.append(builder.submit(
+                build_and_save_index, index_type, config, embeddings, kept_ids))
+
+        for future in in_flight:
+            future.result()
+
+
     print("\n🎉 Enhanced semantic indexing complete!")
     print("\nCreated indexes:")
     for index_type, config in INDEXES.items():
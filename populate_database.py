@@ -1,25 +1,72 @@
 import pandas as pd
 import sqlite3
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from database import create_post_load_indexes
+
+try:
+    import orjson  # ~10x faster than the stdlib for parsing large dumps
+except ImportError:
+    orjson = None
 
 DATABASE_NAME = 'scopus_database.db'
 RAW_DATA_FILENAME = "scopus_raw_data.json"
 
+def _parse_json_bytes(raw):
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+def _load_one_raw_file(path):
+    with open(path, 'rb') as f:
+        if path.endswith('.ndjson'):
+            # Line-delimited dumps (scopus_api streams these) parse one
+            # article per line instead of one giant document
+            return [_parse_json_bytes(line) for line in f if line.strip()]
+        return _parse_json_bytes(f.read())
+
+def load_raw_data(raw_data_filename):
+    """Load the raw Scopus dump: a single JSON file, or a directory of them.
+
+    Incremental extractions drop one file per run into a directory; those
+    are read through a thread pool (file reads release the GIL, so the
+    reads overlap on disk) and each file is parsed with orjson when it is
+    installed. Returns a single concatenated list of article dicts.
+    """
+    if os.path.isdir(raw_data_filename):
+        paths = sorted(
+            os.path.join(raw_data_filename, name)
+            for name in os.listdir(raw_data_filename)
+            if name.endswith(('.json', '.ndjson'))
+        )
+        if not paths:
+            raise FileNotFoundError(f"No .json files in directory '{raw_data_filename}'")
+        with ThreadPoolExecutor(max_workers=min(8, len(paths))) as executor:
+            parts = list(executor.map(_load_one_raw_file, paths))
+        return [article for part in parts for article in part]
+
+    return _load_one_raw_file(raw_data_filename)
+
 # Optional: Add progress tracking for large datasets
 def populate_database(db_name=DATABASE_NAME, raw_data_filename=RAW_DATA_FILENAME):
     """
     Cleans the extracted data from JSON and inserts it into the SQLite database.
     """
-    # Load the raw data extracted from Scopus
+    # Load the raw data extracted from Scopus; newer extractions write the
+    # streamed NDJSON name, so fall back to it when the .json is absent
+    if raw_data_filename == RAW_DATA_FILENAME and not os.path.exists(raw_data_filename):
+        ndjson_filename = 'scopus_raw_data.ndjson'
+        if os.path.exists(ndjson_filename):
+            raw_data_filename = ndjson_filename
+
     try:
         print(f"Loading data from {raw_data_filename}...")
-        with open(raw_data_filename, "r", encoding="utf-8") as f:
-            raw_data = json.load(f)
+        raw_data = load_raw_data(raw_data_filename)
         print(f"✅ Loaded {len(raw_data)} articles from JSON file")
     except FileNotFoundError:
         print(f"❌ Error: '{raw_data_filename}' not found. Please ensure it's in the same directory and run your data extraction script first.")
         return
-    except json.JSONDecodeError:
+    except ValueError:  # includes json.JSONDecodeError and orjson's
         print(f"❌ Error: Could not decode JSON from '{raw_data_filename}'. Check file content for valid JSON.")
         return
 
@@ -38,103 +85,107 @@ def populate_database(db_name=DATABASE_NAME, raw_data_filename=RAW_DATA_FILENAME
     df.drop_duplicates(subset=['scopus_id'], inplace=True)
     print(f"Removed {initial_rows - len(df)} duplicate articles. Remaining: {len(df)}")
 
-    # Fill Missing Values with empty strings to avoid SQLite `None` issues with TEXT columns
-    df = df.fillna({
+    # Fill Missing Values with empty strings to avoid SQLite `None` issues
+    # with TEXT columns (in place — a plain fillna copies the whole frame)
+    df.fillna(value={
         'abstract': '',
         'doi': '',
         'keywords': '',
         'subject_area': '',
         'publication_name': '',
         'cover_date': ''
-    })
+    }, inplace=True)
 
     # --- Normalize Authors and Affiliations for Relational Tables ---
-    # These dictionaries store unique authors/affiliations with a temporary internal ID
-    all_unique_authors = {}
+    # Unique affiliations are stored keyed by their unique key; unique authors
+    # are deduplicated vectorized below
     all_unique_affiliations = {}
 
-    # These lists store the relationships (will use temporary IDs first, then map to real DB IDs)
+    # These lists store the relationships, carrying the unique keys directly so
+    # mapping to real DB IDs later is a plain dict lookup
     article_authors_relations_temp = []
     author_affiliations_relations_temp = []
 
-    current_db_author_temp_id = 1
-    current_db_affiliation_temp_id = 1
-
     print("Processing authors and affiliations for database normalization...")
 
-    for _, row in df.iterrows():
-        article_scopus_id = row['scopus_id']
-
-        # Process Authors for the 'authors' table and 'article_authors' relation
-        for author_entry in row['authors']:
-            scopus_author_id = author_entry.get("author_id") # @auid
-            full_name = author_entry.get("preferred_name")    # preferred-name
-            # Fallback for full name if preferred_name is missing (combining initials and surname)
-            if not full_name:
-                 full_name = f"{author_entry.get('initials', '')} {author_entry.get('surname', '')}".strip()
-            orcid = author_entry.get("orcid")                 # ORCID
-
-            # Create a unique key for lookup, prioritizing Scopus ID. This is used internally for mapping.
-            # Handles cases where Scopus ID might be missing for an author.
-            author_unique_key = scopus_author_id if scopus_author_id else f"{full_name}_{orcid or 'no_orcid'}"
-
-            if author_unique_key not in all_unique_authors:
-                all_unique_authors[author_unique_key] = {
-                    'db_author_id_temp': current_db_author_temp_id, # Temporary internal ID for relations
-                    'scopus_author_id': scopus_author_id,
-                    'full_name': full_name,
-                    'orcid': orcid
-                }
-                current_db_author_temp_id += 1
-            
-            # Store article-author relation using temporary author ID
-            article_authors_relations_temp.append({
-                'article_scopus_id': article_scopus_id,
-                'db_author_id_temp': all_unique_authors[author_unique_key]['db_author_id_temp']
-            })
-
-            # Process Author's Affiliations (using affiliation_ids from author_entry)
-            author_affiliation_ids_scopus = author_entry.get("affiliation_ids", []) # List of Scopus Affiliation IDs from author object
-            if not isinstance(author_affiliation_ids_scopus, list): # Ensure it's a list for iteration
-                author_affiliation_ids_scopus = [author_affiliation_ids_scopus] if author_affiliation_ids_scopus else []
-
-            for afid_scopus in author_affiliation_ids_scopus:
-                if afid_scopus: # Only process if affiliation ID exists
-                    # Find the detailed affiliation object from the article's 'affiliations' list
-                    matched_affil_detail = next((a for a in row['affiliations'] if a.get('affiliation_id') == afid_scopus), None)
-                    
-                    if matched_affil_detail:
-                        institution_name = matched_affil_detail.get('institution_name') # Nom de l'institution
-                        country = matched_affil_detail.get('country')                   # Pays
-
-                        affil_unique_key = afid_scopus if afid_scopus else f"{institution_name}_{country}"
-                        
-                        if affil_unique_key not in all_unique_affiliations:
-                            all_unique_affiliations[affil_unique_key] = {
-                                'db_affiliation_id_temp': current_db_affiliation_temp_id, # Temporary internal ID
-                                'scopus_affiliation_id': afid_scopus,                   # Identifiant Affiliation Scopus
-                                'institution_name': institution_name,
-                                'country': country
-                            }
-                            current_db_affiliation_temp_id += 1
-                        
-                        # Store author-affiliation relation using temporary IDs
-                        author_affiliations_relations_temp.append({
-                            'db_author_id_temp': all_unique_authors[author_unique_key]['db_author_id_temp'],
-                            'db_affiliation_id_temp': all_unique_affiliations[affil_unique_key]['db_affiliation_id_temp']
-                        })
-
-    # Convert unique authors and affiliations to DataFrames for batch insertion
+    # One C-level explode per nested column instead of Python-level
+    # df.iterrows() with nested loops — the slowest idiom in pandas
+    authors_df = df[['scopus_id', 'authors']].explode('authors')
+    authors_df = authors_df[authors_df['authors'].notna()].reset_index(drop=True)
+    auth = pd.json_normalize(authors_df['authors'])
+
+    def _auth_col(name):
+        # json_normalize drops columns absent from every record
+        if name in auth.columns:
+            return auth[name].where(auth[name].notna() & (auth[name] != ''), None)
+        return pd.Series([None] * len(auth), dtype=object)
+
+    scopus_author_ids = _auth_col('author_id')   # @auid
+    preferred_names = _auth_col('preferred_name')
+    # Fallback for full name if preferred_name is missing (initials + surname)
+    fallback_names = (_auth_col('initials').fillna('').astype(str) + ' '
+                      + _auth_col('surname').fillna('').astype(str)).str.strip()
+    full_names = preferred_names.where(preferred_names.notna(), fallback_names)
+    orcids = _auth_col('orcid')
+
+    # Unique key for lookup, prioritizing Scopus ID (may be missing)
+    author_keys = scopus_author_ids.where(
+        scopus_author_ids.notna(),
+        full_names.astype(str) + '_' + orcids.fillna('no_orcid').astype(str)
+    )
+
+    # First occurrence wins, as a C-level hashtable pass over the key column
+    # instead of a Python dict `in` check per author mention
+    first_mask = ~author_keys.duplicated()
+    authors_to_insert_df = pd.DataFrame({
+        'scopus_author_id': scopus_author_ids[first_mask],
+        'full_name': full_names[first_mask],
+        'orcid': orcids[first_mask]
+    }).reset_index(drop=True)
+
+    article_authors_relations_temp = [
+        {'article_scopus_id': article_scopus_id, 'author_unique_key': key}
+        for article_scopus_id, key in zip(authors_df['scopus_id'], author_keys)
+    ]
+
+    # Affiliation details, one explode over the articles' affiliation lists.
+    # Scopus affiliation IDs are global, so the first detail record wins.
+    affil_detail_df = df[['scopus_id', 'affiliations']].explode('affiliations')
+    affil_detail_df = affil_detail_df[affil_detail_df['affiliations'].notna()]
+    affil_details = {}
+    for entry in affil_detail_df['affiliations']:
+        afid_scopus = entry.get('affiliation_id')
+        if afid_scopus and afid_scopus not in affil_details:
+            affil_details[afid_scopus] = {
+                'scopus_affiliation_id': afid_scopus,  # Identifiant Affiliation Scopus
+                'institution_name': entry.get('institution_name'),
+                'country': entry.get('country')
+            }
+
+    # Author -> affiliation pairs via a second explode on affiliation_ids
+    aff_id_lists = _auth_col('affiliation_ids').apply(
+        lambda v: v if isinstance(v, list) else ([v] if v else []))
+    pairs = pd.DataFrame({'author_unique_key': author_keys,
+                          'afid': aff_id_lists}).explode('afid')
+    pairs = pairs[pairs['afid'].notna()]
+
+    for author_key, afid_scopus in zip(pairs['author_unique_key'], pairs['afid']):
+        detail = affil_details.get(afid_scopus)
+        if detail is None:
+            continue  # No detail record for this affiliation ID
+        if afid_scopus not in all_unique_affiliations:
+            all_unique_affiliations[afid_scopus] = detail
+        author_affiliations_relations_temp.append({
+            'author_unique_key': author_key,
+            'affil_unique_key': afid_scopus
+        })
+
+    # Convert unique affiliations to a DataFrame for batch insertion
     # We drop the temporary internal IDs as they are not part of the final DB schema
-    print(f"📊 Found {len(all_unique_authors)} unique authors and {len(all_unique_affiliations)} unique affiliations")
-    
-    if all_unique_authors:
-        authors_to_insert_df = pd.DataFrame(list(all_unique_authors.values())).drop(columns=['db_author_id_temp'])
-    else:
-        authors_to_insert_df = pd.DataFrame(columns=['scopus_author_id', 'full_name', 'orcid'])
-    
+    print(f"📊 Found {len(authors_to_insert_df)} unique authors and {len(all_unique_affiliations)} unique affiliations")
+
     if all_unique_affiliations:
-        affiliations_to_insert_df = pd.DataFrame(list(all_unique_affiliations.values())).drop(columns=['db_affiliation_id_temp'])
+        affiliations_to_insert_df = pd.DataFrame(list(all_unique_affiliations.values()))
     else:
         affiliations_to_insert_df = pd.DataFrame(columns=['scopus_affiliation_id', 'institution_name', 'country'])
 
@@ -145,31 +196,46 @@ def populate_database(db_name=DATABASE_NAME, raw_data_filename=RAW_DATA_FILENAME
         cursor = conn.cursor()
         print(f"Connected to database: {db_name} for data population.")
 
-        # Ensure foreign keys are enabled (important for integrity)
-        cursor.execute("PRAGMA foreign_keys = ON;")
-
-        # Helper function for batch insertion to avoid SQLite variable limits
-        def insert_in_batches(df, table_name, batch_size=1000):
-            total_rows = len(df)
-            for i in range(0, total_rows, batch_size):
-                batch = df.iloc[i:i+batch_size]
-                batch.to_sql(table_name, conn, if_exists='append', index=False, method='multi')
-                print(f"  Inserted batch {i//batch_size + 1}: {len(batch)} rows (Progress: {min(i+batch_size, total_rows)}/{total_rows})")
-
-        # Insert main article data in batches
-        articles_df_to_insert = df[['scopus_id', 'title', 'abstract', 'cover_date', 'publication_name', 'doi', 'keywords', 'subject_area']].copy()
+        # Bulk-load pragmas: no journal or fsync while we own the file, temp
+        # structures in RAM, and a large page cache (~256MB)
+        cursor.execute("PRAGMA journal_mode = OFF;")
+        cursor.execute("PRAGMA synchronous = OFF;")
+        cursor.execute("PRAGMA temp_store = MEMORY;")
+        cursor.execute("PRAGMA cache_size = -262144;")
+
+        # Foreign keys stay off during the bulk load; the normalization above
+        # only emits relations for rows it just inserted, and skipping the
+        # per-row FK probes speeds up the relation tables noticeably
+        cursor.execute("PRAGMA foreign_keys = OFF;")
+
+        # Helper for bulk insertion: one prepared statement via executemany,
+        # all inserts inside the connection's single open transaction
+        def insert_dataframe(df, table_name):
+            columns = ', '.join(df.columns)
+            placeholders = ', '.join('?' * len(df.columns))
+            # NaN from missing JSON keys must become NULL, not a float; only
+            # pay for the object copy when the frame actually has NaNs
+            if df.isna().any().any():
+                df = df.astype(object).where(df.notna(), None)
+            cursor.executemany(
+                f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})",
+                df.itertuples(index=False, name=None)
+            )
+
+        # Insert main article data (a view is enough — we only iterate it)
+        articles_df_to_insert = df.loc[:, ['scopus_id', 'title', 'abstract', 'cover_date', 'publication_name', 'doi', 'keywords', 'subject_area']]
         print(f"Inserting {len(articles_df_to_insert)} articles into 'articles' table...")
-        insert_in_batches(articles_df_to_insert, 'articles')
+        insert_dataframe(articles_df_to_insert, 'articles')
         print(f"✅ Completed: Inserted {len(articles_df_to_insert)} articles into 'articles' table.")
 
-        # Insert unique authors in batches
+        # Insert unique authors
         print(f"Inserting {len(authors_to_insert_df)} unique authors into 'authors' table...")
-        insert_in_batches(authors_to_insert_df, 'authors')
+        insert_dataframe(authors_to_insert_df, 'authors')
         print(f"✅ Completed: Inserted {len(authors_to_insert_df)} unique authors into 'authors' table.")
 
-        # Insert unique affiliations in batches
+        # Insert unique affiliations
         print(f"Inserting {len(affiliations_to_insert_df)} unique affiliations into 'affiliations' table...")
-        insert_in_batches(affiliations_to_insert_df, 'affiliations')
+        insert_dataframe(affiliations_to_insert_df, 'affiliations')
         print(f"✅ Completed: Inserted {len(affiliations_to_insert_df)} unique affiliations into 'affiliations' table.")
 
         # --- Populate Relationship Tables ---
@@ -196,10 +262,9 @@ def populate_database(db_name=DATABASE_NAME, raw_data_filename=RAW_DATA_FILENAME
         # Prepare and insert article_authors relations in batches
         final_article_authors_relations = []
         for rel in article_authors_relations_temp:
-            # Find the original unique key (Scopus ID or generated composite key) for this temporary author ID
-            original_author_key = next((k for k, v in all_unique_authors.items() if v['db_author_id_temp'] == rel['db_author_id_temp']), None)
-            if original_author_key and original_author_key in actual_author_id_map:
-                actual_author_id = actual_author_id_map[original_author_key]
+            # The relation carries the unique key, so mapping is one dict lookup
+            actual_author_id = actual_author_id_map.get(rel['author_unique_key'])
+            if actual_author_id is not None:
                 final_article_authors_relations.append({
                     'article_scopus_id': rel['article_scopus_id'],
                     'author_id': actual_author_id
@@ -208,21 +273,16 @@ def populate_database(db_name=DATABASE_NAME, raw_data_filename=RAW_DATA_FILENAME
         if final_article_authors_relations:
             article_authors_df = pd.DataFrame(final_article_authors_relations).drop_duplicates()
             print(f"Inserting {len(article_authors_df)} article-author relations...")
-            insert_in_batches(article_authors_df, 'article_authors')
+            insert_dataframe(article_authors_df, 'article_authors')
             print(f"✅ Completed: Inserted {len(article_authors_df)} article-author relations.")
 
         # Prepare and insert author_affiliations relations in batches
         final_author_affiliations_relations = []
         for rel in author_affiliations_relations_temp:
-            original_author_key = next((k for k, v in all_unique_authors.items() if v['db_author_id_temp'] == rel['db_author_id_temp']), None)
-            original_affil_key = next((k for k, v in all_unique_affiliations.items() if v['db_affiliation_id_temp'] == rel['db_affiliation_id_temp']), None)
-
-            if original_author_key and original_affil_key and \
-               original_author_key in actual_author_id_map and \
-               original_affil_key in actual_affiliation_id_map:
-                
-                actual_author_id = actual_author_id_map[original_author_key]
-                actual_affiliation_id = actual_affiliation_id_map[original_affil_key]
+            actual_author_id = actual_author_id_map.get(rel['author_unique_key'])
+            actual_affiliation_id = actual_affiliation_id_map.get(rel['affil_unique_key'])
+
+            if actual_author_id is not None and actual_affiliation_id is not None:
                 final_author_affiliations_relations.append({
                     'author_id': actual_author_id,
                     'affiliation_id': actual_affiliation_id
@@ -231,10 +291,14 @@ def populate_database(db_name=DATABASE_NAME, raw_data_filename=RAW_DATA_FILENAME
         if final_author_affiliations_relations:
             author_affiliations_df = pd.DataFrame(final_author_affiliations_relations).drop_duplicates()
             print(f"Inserting {len(author_affiliations_df)} author-affiliation relations...")
-            insert_in_batches(author_affiliations_df, 'author_affiliations')
+            insert_dataframe(author_affiliations_df, 'author_affiliations')
             print(f"✅ Completed: Inserted {len(author_affiliations_df)} author-affiliation relations.")
 
         conn.commit()
+
+        # Build the unique/lookup indexes now that the tables are full
+        create_post_load_indexes(db_name)
+
         print("\n🎉 === DATABASE POPULATION COMPLETE ===")
         print(f"📊 Successfully populated database with:")
         print(f"   • {len(articles_df_to_insert):,} articles")
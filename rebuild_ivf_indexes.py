@@ -0,0 +1,89 @@
+import faiss
+import numpy as np
+import os
+
+# Rebuilds the existing flat FAISS indexes as IVF indexes (offline, one-time).
+# Flat indexes scan every vector per query (O(N*d)) and keep all vectors in
+# RAM as float32. IVF probes only a few clusters per query and, with OPQ+PQ
+# on the large 'full' index, cuts bytes/vector ~16-32x.
+
+INDEX_FILES = {
+    'content': 'scopus_content_index.faiss',
+    'metadata': 'scopus_metadata_index.faiss',
+    'institution': 'scopus_institution_index.faiss',
+    'full': 'scopus_full_index.faiss'
+}
+
+# The 'full' index is the largest and gets the compressed OPQ+IVF+PQ recipe;
+# the others stay uncompressed (IVF,Flat) for exact distances within probes.
+COMPRESSED_INDEX_TYPES = {'full'}
+
+MAX_TRAIN_SAMPLES = 100000
+
+
+def choose_factory_string(num_vectors, index_type):
+    """Pick an index_factory recipe scaled to the corpus size."""
+    # Rule of thumb: nlist ~ 4*sqrt(N), and training wants >= ~39 points/list
+    nlist = int(4 * np.sqrt(num_vectors))
+    nlist = max(64, min(nlist, num_vectors // 39 if num_vectors >= 39 else 1))
+
+    if num_vectors < 10 * nlist:
+        return None, nlist  # Too small for IVF, keep the flat index
+
+    if index_type in COMPRESSED_INDEX_TYPES:
+        return f"OPQ32_128,IVF{nlist}_HNSW32,PQ32", nlist
+
+    return f"IVF{nlist},Flat", nlist
+
+
+def rebuild_index(faiss_file, index_type):
+    """Rebuild a single flat index file as IVF, training on its own vectors."""
+    print(f"\n🔄 Rebuilding '{index_type}' index from {faiss_file}...")
+
+    flat_index = faiss.read_index(faiss_file)
+    num_vectors = flat_index.ntotal
+    dimension = flat_index.d
+    print(f"📊 {num_vectors:,} vectors, {dimension} dimensions")
+
+    factory_string, nlist = choose_factory_string(num_vectors, index_type)
+    if factory_string is None:
+        print(f"⚠️ '{index_type}' is too small for IVF ({num_vectors:,} vectors), keeping flat index")
+        return
+
+    # Reconstruct the stored (already normalized) vectors from the flat index
+    vectors = flat_index.reconstruct_n(0, num_vectors)
+
+    print(f"🏗️ Building {factory_string} (nlist={nlist})...")
+    ivf_index = faiss.index_factory(dimension, factory_string, faiss.METRIC_INNER_PRODUCT)
+
+    # Train on a sample; full training data is unnecessary and slow
+    if num_vectors > MAX_TRAIN_SAMPLES:
+        sample_indices = np.random.default_rng(42).choice(num_vectors, MAX_TRAIN_SAMPLES, replace=False)
+        ivf_index.train(vectors[np.sort(sample_indices)])
+    else:
+        ivf_index.train(vectors)
+
+    ivf_index.add(vectors)
+
+    faiss.write_index(ivf_index, faiss_file)
+    print(f"💾 Saved IVF index: {faiss_file}")
+
+
+def rebuild_all_indexes():
+    """Convert every existing flat index file to an IVF index in place."""
+    print("🚀 Starting IVF index rebuild...")
+
+    for index_type, faiss_file in INDEX_FILES.items():
+        if not os.path.exists(faiss_file):
+            print(f"⚠️ Skipping '{index_type}': {faiss_file} not found")
+            continue
+        try:
+            rebuild_index(faiss_file, index_type)
+        except Exception as e:
+            print(f"❌ Failed to rebuild '{index_type}': {e}")
+
+    print("\n🎉 IVF rebuild complete! The app will pick up the new indexes on next start.")
+
+
+if __name__ == "__main__":
+    rebuild_all_indexes()
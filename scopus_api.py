@@ -1,7 +1,41 @@
 import requests
+from requests.adapters import HTTPAdapter
 import json
+import logging
 import os
+import random
+import sqlite3
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson  # bytes-native and ~2-5x faster than stdlib json
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# The per-batch/per-article chatter goes through logging so verbosity is a
+# config switch: at INFO the guarded debug blocks skip their f-string
+# formatting entirely, which matters across thousands of articles
+logger = logging.getLogger(__name__)
+
+def _loads(raw):
+    # Both parsers take raw response bytes directly: Scopus always sends
+    # UTF-8, so response.json()'s charset sniff and str copy are skipped
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+def _dumps(obj):
+    if orjson is not None:
+        return orjson.dumps(obj).decode('utf-8')
+    # Match orjson's output: compact separators (no space padding) and raw
+    # UTF-8 instead of \uXXXX escapes, which bloat non-ASCII abstracts 6x
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
 
 # --- Configuration ---
 API_KEY = "YOUR_SCOPUS_API_KEY_HERE"  # Replace with your actual Scopus API Key
@@ -10,12 +44,125 @@ INST_TOKEN = "YOUR_SCOPUS_INST_TOKEN_HERE" # Replace with your actual Scopus Ins
 SEARCH_ENDPOINT = "https://api.elsevier.com/content/search/scopus"
 ABSTRACT_ENDPOINT = "https://api.elsevier.com/content/abstract/scopus_id/{scopus_id}"
 
+# Only the fields the pipeline actually consumes — the server drops the
+# rest, shrinking payloads (and the JSON parse behind them) several-fold
+SEARCH_FIELDS = ("eid,dc:title,dc:description,prism:coverDate,"
+                 "prism:publicationName,prism:doi,authkeywords,subject-areas,"
+                 "author,affiliation")
+ABSTRACT_FIELDS = "dc:description,authkeywords,authors,affiliation"
+
+# A COMPLETE search entry whose description is at least this long already
+# carries everything the pipeline needs (the abstract endpoint only wins
+# when dc:description is truncated), so the per-article round trip is
+# skipped entirely
+SKIP_ABSTRACT_MIN_DESCRIPTION = 400
+
 headers = {
     "X-ELS-APIKey": API_KEY,
     "X-ELS-Insttoken": INST_TOKEN,
-    "Accept": "application/json"
+    "Accept": "application/json",
+    # JSON full of repeated field names compresses 5-10x; requests decodes
+    # transparently, so this is pure bandwidth (and latency) savings
+    "Accept-Encoding": "gzip, deflate"
 }
 
+# One session for all Scopus calls: urllib3 pools connections and keeps them
+# alive, so the thousands of search + abstract requests share a handful of
+# TCP/TLS handshakes instead of paying one each.
+_session = requests.Session()
+_session.headers.update(headers)
+_session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
+
+# Abstract fetches for a search page run concurrently on this pool; blocking
+# sockets release the GIL, so ten requests overlap their wire time. The
+# worker count bounds in-flight requests against Scopus' per-second quota.
+ABSTRACT_FETCH_WORKERS = 10
+_abstract_pool = ThreadPoolExecutor(max_workers=ABSTRACT_FETCH_WORKERS)
+
+# Every HTTP call funnels through this gate, so aggregate in-flight requests
+# stay inside the Scopus quota no matter how many year extractions run at once
+_request_gate = threading.Semaphore(ABSTRACT_FETCH_WORKERS)
+
+class AdaptiveTokenBucket:
+    """Client-side request pacing tuned by server feedback (AIMD).
+
+    Tokens refill at `rate` per second up to `capacity`; each request costs
+    one. Successes grow the rate additively, throttle signals (429 or a
+    dwindling X-RateLimit-Remaining) shrink it multiplicatively, so the
+    pace converges on whatever the server currently allows instead of the
+    guesswork of fixed sleeps.
+    """
+
+    def __init__(self, rate=5.0, capacity=10.0, min_rate=0.5, max_rate=9.0):
+        self._lock = threading.Lock()
+        self.rate = rate
+        self.capacity = capacity
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self._tokens = capacity
+        self._last_refill = time.monotonic()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity,
+                                   self._tokens + (now - self._last_refill) * self.rate)
+                self._last_refill = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def on_success(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + 0.1)
+
+    def on_throttle(self):
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2.0)
+
+_rate_bucket = AdaptiveTokenBucket()
+
+# On-disk cache of raw abstract responses keyed by scopus_id. Re-runs after
+# a crash (and parser-debugging runs) replay from here instead of paying
+# ~4500 HTTP round trips again. One shared connection guarded by a lock,
+# since the abstract pool threads all read and write it.
+ABSTRACT_CACHE_DB = 'abstract_cache.db'
+_abstract_cache_lock = threading.Lock()
+_abstract_cache_conn = sqlite3.connect(ABSTRACT_CACHE_DB, check_same_thread=False)
+_abstract_cache_conn.execute(
+    "CREATE TABLE IF NOT EXISTS abstracts (scopus_id TEXT PRIMARY KEY, json BLOB)")
+
+def _abstract_cache_get(scopus_id):
+    with _abstract_cache_lock:
+        row = _abstract_cache_conn.execute(
+            "SELECT json FROM abstracts WHERE scopus_id = ?", (scopus_id,)).fetchone()
+    return _loads(row[0]) if row else None
+
+def _abstract_cache_put(scopus_id, raw_json):
+    with _abstract_cache_lock:
+        _abstract_cache_conn.execute(
+            "INSERT OR REPLACE INTO abstracts (scopus_id, json) VALUES (?, ?)",
+            (scopus_id, raw_json))
+        _abstract_cache_conn.commit()
+
+def _scopus_get(url, **kwargs):
+    with _request_gate:
+        _rate_bucket.acquire()
+        response = _session.get(url, **kwargs)
+
+    if response.status_code == 429:
+        _rate_bucket.on_throttle()
+    else:
+        _rate_bucket.on_success()
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        if remaining is not None and remaining.isdigit() and int(remaining) < ABSTRACT_FETCH_WORKERS:
+            # Quota nearly exhausted; back off before the server starts 429ing
+            _rate_bucket.on_throttle()
+    return response
+
 # --- Search Query Parameters ---
 domains = [
     "COMP",  # Computer Science
@@ -35,7 +182,52 @@ domains = [
     "SOCI"   # Social Sciences
 ]
 
-subj_area_query_part = " OR ".join([f"SUBJAREA({domain})" for domain in domains])
+# Invariant across years and runs, so built exactly once
+SUBJ_AREA_QUERY = " OR ".join(f"SUBJAREA({domain})" for domain in domains)
+
+# Articles stream to this file as line-delimited JSON while extraction runs,
+# so a crash keeps everything fetched so far and peak memory stays flat
+OUTPUT_FILENAME = "scopus_raw_data.ndjson"
+_output_lock = threading.Lock()
+
+# Each year also streams into its own shard; a complete shard is loaded
+# from disk on the next run instead of re-extracted, so a crash in one
+# year costs a retry of that year only
+def _year_shard_filename(year):
+    return f"scopus_{year}.ndjson"
+
+def _load_year_shard(year):
+    """Return the articles already in a year's shard, or None if absent."""
+    path = _year_shard_filename(year)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        return [_loads(line) for line in f if line.strip()]
+
+def _append_articles(output_file, articles):
+    """Append finished articles to the NDJSON dump (thread-safe)."""
+    if output_file is None or not articles:
+        return
+    lines = ''.join(_dumps(article) + '\n' for article in articles)
+    with _output_lock:
+        output_file.write(lines)
+        output_file.flush()
+
+PARQUET_FILENAME = "scopus_raw_data.parquet"
+
+def write_parquet_dump(articles, filename=PARQUET_FILENAME):
+    """Write a columnar copy of the corpus when pyarrow is installed.
+
+    Arrow transposes the dict-per-article rows into one array per field;
+    downstream loaders then read zstd-compressed Parquet columns at memory
+    bandwidth instead of re-parsing a multi-hundred-MB JSON dump. The
+    NDJSON stream stays the source of truth, so this is purely additive.
+    """
+    if pa is None or not articles:
+        return False
+    table = pa.Table.from_pylist(articles)
+    pq.write_table(table, filename, compression='zstd')
+    return True
 
 # Target years and articles per year
 TARGET_YEARS = [2018, 2019, 2020, 2021, 2022, 2023, 2024]
@@ -46,6 +238,15 @@ print(f"🎯 Target distribution: {ARTICLES_PER_YEAR} articles per year from {TA
 print(f"📊 Total target: {ARTICLES_PER_YEAR * len(TARGET_YEARS)} articles")
 print(f"🔍 Subject areas: {len(domains)} domains")  
 
+def _extract_year(api_key, inst_token, search_endpoint, abstract_endpoint, query,
+                  articles_per_request, articles_per_year, year):
+    """Extract one year, streaming its articles into the year's shard."""
+    with open(_year_shard_filename(year), 'w', encoding='utf-8') as shard:
+        return extract_articles_for_specific_query(
+            api_key, inst_token, search_endpoint, abstract_endpoint, query,
+            articles_per_request, articles_per_year, year, output_file=shard
+        )
+
 def extract_data_from_scopus_by_year(api_key, inst_token, search_endpoint, abstract_endpoint,
                                    domains, target_years, articles_per_year, articles_per_request):
     """Extract articles year by year to ensure proper distribution across all target years."""
@@ -58,30 +259,40 @@ def extract_data_from_scopus_by_year(api_key, inst_token, search_endpoint, abstr
     print(f"🔍 Subject areas: {len(domains)} domains")
     print("-" * 60)
 
-    for year in target_years:
-        print(f"\n📅 === EXTRACTING ARTICLES FROM {year} ===")
-        
-        # Create year-specific query
-        subj_area_query = " OR ".join([f"SUBJAREA({domain})" for domain in domains])
-        year_query = f"({subj_area_query}) AND (PUBYEAR = {year})"
-        
-        print(f"🔍 Query for {year}: PUBYEAR = {year}")
-        
-        year_articles = extract_articles_for_specific_query(
-            api_key, inst_token, search_endpoint, abstract_endpoint,
-            year_query, articles_per_request, articles_per_year, year
-        )
-        
-        all_extracted_data.extend(year_articles)
-        year_stats[year] = len(year_articles)
-        
-        print(f"✅ {year}: Collected {len(year_articles)} articles")
-        
-        # Small delay between years
-        if year != target_years[-1]:  # Don't delay after the last year
-            print(f"⏱️  Brief pause before next year...")
-            time.sleep(2)
-    
+    # Years are independent queries, so they run concurrently; total wall
+    # time approaches the slowest year instead of the sum. The shared
+    # request gate keeps the aggregate rate the same as before, so no
+    # inter-year pause is needed.
+    with ThreadPoolExecutor(max_workers=len(target_years)) as year_pool:
+        year_futures = {}
+        resumed_years = {}
+        for year in target_years:
+            # Resume: a complete shard from an earlier run is loaded from
+            # disk instead of re-extracted
+            existing = _load_year_shard(year)
+            if existing is not None and len(existing) >= articles_per_year:
+                print(f"⏭️  {year}: Shard already complete ({len(existing)} articles), skipping extraction")
+                resumed_years[year] = existing
+                continue
+
+            print(f"📅 Queued extraction for {year}")
+            year_futures[year] = year_pool.submit(
+                _extract_year,
+                api_key, inst_token, search_endpoint, abstract_endpoint,
+                f"({SUBJ_AREA_QUERY}) AND (PUBYEAR = {year})",
+                articles_per_request, articles_per_year, year
+            )
+
+        for year in target_years:
+            if year in resumed_years:
+                year_articles = resumed_years[year]
+            else:
+                year_articles = year_futures[year].result()
+            all_extracted_data.extend(year_articles)
+            year_stats[year] = len(year_articles)
+            print(f"✅ {year}: Collected {len(year_articles)} articles")
+
+
     # Final statistics
     print(f"\n🎉 === YEAR-BY-YEAR EXTRACTION COMPLETE ===")
     print(f"📊 Total articles collected: {len(all_extracted_data)}")
@@ -93,49 +304,219 @@ def extract_data_from_scopus_by_year(api_key, inst_token, search_endpoint, abstr
     
     return all_extracted_data
 
+# Institutions and authors repeat massively across a corpus, so records are
+# interned: repeats share one dict object instead of allocating a fresh one
+# per mention. Affiliations are keyed by afid alone (the record is stable),
+# but author mentions carry article-specific affiliation_ids, so the author
+# pool is keyed on (authid, affiliation tuple) — a pooled record is only
+# reused when the affiliations match too. dict.setdefault-style access is
+# atomic under the GIL, so the abstract pool threads share these safely;
+# records are never mutated after creation. Entries without an id are not
+# interned.
+_author_pool = {}
+_affil_pool = {}
+
+def _intern(pool, key, record):
+    if not key:
+        return record
+    return pool.setdefault(key, record)
+
+def _as_list(value):
+    """Normalize Scopus JSON, which collapses single-element lists to bare
+    dicts and omits empty ones entirely."""
+    return value if isinstance(value, list) else ([value] if isinstance(value, dict) else [])
+
+def merge_search_entry_details(entry, article_data):
+    """Fill authors/affiliations from a COMPLETE search entry.
+
+    The search view names these fields differently from the abstract
+    endpoint (authid/authname/afid vs @auid/ce:indexed-name/@id), hence
+    the parallel mapping. Returns True when the entry carried author data,
+    which lets the caller skip the abstract round trip for articles whose
+    search-level description is already complete.
+    """
+    processed_authors = []
+    for auth in _as_list(entry.get("author")):
+        if isinstance(auth, dict):
+            affiliation_ids = [af.get('$') for af in _as_list(auth.get("afid"))
+                               if isinstance(af, dict) and af.get('$')]
+
+            author_id = auth.get("authid")
+            author_key = (author_id, tuple(affiliation_ids)) if author_id else None
+            processed_authors.append(_intern(_author_pool, author_key, {
+                "author_id": auth.get("authid", ""),
+                "preferred_name": auth.get("authname", ""),
+                "initials": auth.get("initials", ""),
+                "surname": auth.get("surname", ""),
+                "orcid": auth.get("orcid", ""),
+                "affiliation_ids": affiliation_ids
+            }))
+
+    processed_affiliations = []
+    for affil in _as_list(entry.get("affiliation")):
+        if isinstance(affil, dict):
+            processed_affiliations.append(_intern(_affil_pool, affil.get("afid"), {
+                "affiliation_id": affil.get("afid", ""),
+                "institution_name": affil.get("affilname", ""),
+                "country": affil.get("affiliation-country", "")
+            }))
+
+    if processed_authors:
+        article_data["authors"] = processed_authors
+    if processed_affiliations:
+        article_data["affiliations"] = processed_affiliations
+    return bool(processed_authors)
+
+def fetch_abstract_details(article_data, abstract_endpoint=ABSTRACT_ENDPOINT):
+    """Fetch the FULL abstract record for one article and merge it in place.
+
+    Runs on the abstract thread pool, so errors are swallowed here — one
+    failed lookup keeps its search-level data and never sinks the batch.
+    """
+    scopus_id = article_data["scopus_id"]
+    abstract_lookup_scopus_id = scopus_id.replace("2-s2.0-", "")
+    abstract_url = abstract_endpoint.format(scopus_id=abstract_lookup_scopus_id)
+    abstract_params = {"view": "FULL", "field": ABSTRACT_FIELDS}
+
+    try:
+        abstract_result = _abstract_cache_get(scopus_id)
+        if abstract_result is None:
+            abstract_response = _scopus_get(abstract_url, params=abstract_params)
+            abstract_response.raise_for_status()
+            abstract_result = _loads(abstract_response.content)
+            _abstract_cache_put(scopus_id, abstract_response.content)
+
+        # Get better abstract
+        abstract_coredata = abstract_result.get("abstracts-retrieval-response", {}).get("coredata", {})
+        article_data["abstract"] = abstract_coredata.get("dc:description", article_data["abstract"]) or article_data["abstract"]
+
+        # Get keywords
+        auth_keywords_from_abstract = abstract_coredata.get("authkeywords", {})
+        keywords_list = []
+        if isinstance(auth_keywords_from_abstract, dict):
+            keywords_list = [kw_entry['$']
+                             for kw_entry in _as_list(auth_keywords_from_abstract.get('author-keyword'))
+                             if isinstance(kw_entry, dict) and '$' in kw_entry]
+        elif isinstance(auth_keywords_from_abstract, str):
+            keywords_list.append(auth_keywords_from_abstract)
+
+        article_data["keywords"] = ", ".join(keywords_list) if keywords_list else article_data["keywords"]
+
+        # Get authors
+        authors_from_abstract = abstract_result.get("abstracts-retrieval-response", {}).get("authors", {}).get("author", [])
+        processed_authors = []
+
+        for auth in _as_list(authors_from_abstract):
+            if isinstance(auth, dict):
+                author_affiliation_ids = [af_obj.get('@id') for af_obj in _as_list(auth.get('affiliation'))
+                                          if isinstance(af_obj, dict) and af_obj.get('@id')]
+
+                author_id = auth.get("@auid")
+                author_key = (author_id, tuple(author_affiliation_ids)) if author_id else None
+                processed_authors.append(_intern(_author_pool, author_key, {
+                    "author_id": auth.get("@auid", ""),
+                    "preferred_name": auth.get("ce:indexed-name", ""),
+                    "initials": auth.get("ce:initials", ""),
+                    "surname": auth.get("ce:surname", ""),
+                    "orcid": auth.get("orcid", ""),
+                    "affiliation_ids": author_affiliation_ids
+                }))
+        article_data["authors"] = processed_authors
+
+        # Get affiliations
+        affiliations_from_abstract = abstract_result.get("abstracts-retrieval-response", {}).get("affiliation", [])
+        processed_affiliations = []
+
+        for affil in _as_list(affiliations_from_abstract):
+            if isinstance(affil, dict):
+                country_val = affil.get("affiliation-country", "")
+
+                processed_affiliations.append(_intern(_affil_pool, affil.get("@id"), {
+                    "affiliation_id": affil.get("@id", ""),
+                    "institution_name": affil.get("affilname", ""),
+                    "country": country_val
+                }))
+        article_data["affiliations"] = processed_affiliations
+
+    except requests.HTTPError as e:
+        if e.response.status_code != 404:  # Don't spam 404s
+            logger.warning(f"   Abstract HTTP error for {scopus_id}: {e.response.status_code}")
+    except json.JSONDecodeError:
+        logger.warning(f"   Abstract JSON parsing error for {scopus_id}")
+    except Exception as e:
+        logger.warning(f"   Abstract retrieval error for {scopus_id}: {e}")
+
 def extract_articles_for_specific_query(api_key, inst_token, search_endpoint, abstract_endpoint,
-                                       query, articles_per_request, max_articles, year):
+                                       query, articles_per_request, max_articles, year,
+                                       output_file=None):
     """Extract articles for a specific query (usually year-specific)."""
     articles_for_query = []
     current_start = 0
     first_request = True
-    
-    request_headers = {
-        "X-ELS-APIKey": api_key,
-        "X-ELS-Insttoken": inst_token,
-        "Accept": "application/json"
-    }
+    cursor = "*"
+
+    # Single-slot prefetch: the next page's GET runs here while the current
+    # page's abstracts are being fetched, hiding one search RTT per page
+    prefetch_pool = ThreadPoolExecutor(max_workers=1)
+    next_response_future = None
 
     while len(articles_for_query) < max_articles:
         params = {
             "query": query,
             "count": articles_per_request,
             "view": "COMPLETE",
-            "start": current_start
+            "field": SEARCH_FIELDS,
+            # Stable order so cursor paging never skips or repeats entries
+            "sort": "coverDate"
         }
+        # Cursor paging keeps the paging state on the server and has no
+        # 5000-result start ceiling; start= offsets stay as the fallback
+        # if a response ever comes back without a cursor
+        if cursor is not None:
+            params["cursor"] = cursor
+        else:
+            params["start"] = current_start
 
         try:
             progress_pct = (len(articles_for_query) / max_articles) * 100
-            print(f"   📥 {year} - Batch from start={current_start} | Progress: {len(articles_for_query)}/{max_articles} ({progress_pct:.1f}%)")
+            logger.info(f"   📥 {year} - Batch from start={current_start} | Progress: {len(articles_for_query)}/{max_articles} ({progress_pct:.1f}%)")
             
-            response = requests.get(search_endpoint, headers=request_headers, params=params)
+            if next_response_future is not None:
+                response = next_response_future.result()
+                next_response_future = None
+            else:
+                response = _scopus_get(search_endpoint, params=params)
             response.raise_for_status()
-            search_results = response.json()
+            search_results = _loads(response.content)
 
             if first_request:
                 total_results_str = search_results.get("search-results", {}).get("opensearch:totalResults", "0")
                 total_available = int(total_results_str) if total_results_str.isdigit() else 0
-                print(f"   🎉 {year}: {total_available:,} total articles available")
+                logger.info(f"   🎉 {year}: {total_available:,} total articles available")
                 first_request = False
 
+            cursor_info = search_results.get("search-results", {}).get("cursor", {})
+            cursor = cursor_info.get("@next") if isinstance(cursor_info, dict) else None
+
             entries = search_results.get("search-results", {}).get("entry", [])
             if not entries:
-                print(f"   🔚 {year}: No more entries found")
+                logger.info(f"   🔚 {year}: No more entries found")
                 break
 
-            batch_count = 0
+            # Kick off the next page before processing this one; a 429 on
+            # the prefetched response surfaces via raise_for_status above
+            # and retries with the same cursor
+            if cursor is not None and len(articles_for_query) + len(entries) < max_articles:
+                next_params = dict(params)
+                next_params.pop("start", None)
+                next_params["cursor"] = cursor
+                next_response_future = prefetch_pool.submit(
+                    _scopus_get, search_endpoint, params=next_params)
+
+            batch_articles = []
+            needs_abstract = []
             for entry in entries:
-                if len(articles_for_query) >= max_articles:
+                if len(articles_for_query) + len(batch_articles) >= max_articles:
                     break
 
                 scopus_id = entry.get("eid", "")
@@ -156,143 +537,92 @@ def extract_articles_for_specific_query(api_key, inst_token, search_endpoint, ab
                     "affiliations": []
                 }
                 
-                # Debug first few articles from each year
-                if len(articles_for_query) < 3:
-                    print(f"   🔍 {year} Sample {len(articles_for_query)+1}:")
-                    print(f"      Title: {entry.get('dc:title', '')[:60]}...")
-                    print(f"      Cover Date: {entry.get('prism:coverDate', '')}")
-                    print(f"      Forced Year: {year}")
+                # Debug first few articles from each year; the guard skips
+                # the f-string formatting entirely at INFO level
+                if logger.isEnabledFor(logging.DEBUG) and len(articles_for_query) + len(batch_articles) < 3:
+                    logger.debug(f"   🔍 {year} Sample {len(articles_for_query) + len(batch_articles) + 1}:")
+                    logger.debug(f"      Title: {entry.get('dc:title', '')[:60]}...")
+                    logger.debug(f"      Cover Date: {entry.get('prism:coverDate', '')}")
+                    logger.debug(f"      Forced Year: {year}")
                 
-                # Get subject areas
+                # Get subject areas: dict.fromkeys dedups in one C-level
+                # pass and keeps insertion order, replacing the per-article
+                # set + list + sort allocations
                 subject_areas_raw = entry.get("subject-areas", {}).get("subject-area", [])
-                if subject_areas_raw:
-                    if isinstance(subject_areas_raw, list):
-                        abbrevs = set()
-                        for subj in subject_areas_raw:
-                            if isinstance(subj, dict) and subj.get("@abbrev"):
-                                abbrevs.add(subj["@abbrev"])
-                        article_data["subject_area"] = ", ".join(sorted(list(abbrevs)))
-                    elif isinstance(subject_areas_raw, dict) and subject_areas_raw.get("@abbrev"):
-                        article_data["subject_area"] = subject_areas_raw["@abbrev"]
-
-                # Get full abstract and author info
-                abstract_lookup_scopus_id = scopus_id.replace("2-s2.0-", "")
-                abstract_url = abstract_endpoint.format(scopus_id=abstract_lookup_scopus_id)
-                abstract_params = {"view": "FULL"}
-
-                try:
-                    time.sleep(0.05)
-                    abstract_response = requests.get(abstract_url, headers=request_headers, params=abstract_params)
-                    abstract_response.raise_for_status()
-                    abstract_result = abstract_response.json()
-
-                    # Get better abstract
-                    abstract_coredata = abstract_result.get("abstracts-retrieval-response", {}).get("coredata", {})
-                    article_data["abstract"] = abstract_coredata.get("dc:description", article_data["abstract"]) or article_data["abstract"]
-
-                    # Get keywords
-                    auth_keywords_from_abstract = abstract_coredata.get("authkeywords", {})
-                    keywords_list = []
-                    if isinstance(auth_keywords_from_abstract, dict) and 'author-keyword' in auth_keywords_from_abstract:
-                        if isinstance(auth_keywords_from_abstract['author-keyword'], list):
-                            for kw_entry in auth_keywords_from_abstract['author-keyword']:
-                                if isinstance(kw_entry, dict) and '$' in kw_entry:
-                                    keywords_list.append(kw_entry['$'])
-                        elif isinstance(auth_keywords_from_abstract['author-keyword'], dict) and '$' in auth_keywords_from_abstract['author-keyword']:
-                            keywords_list.append(auth_keywords_from_abstract['author-keyword']['$'])
-                    elif isinstance(auth_keywords_from_abstract, str):
-                        keywords_list.append(auth_keywords_from_abstract)
-
-                    article_data["keywords"] = ", ".join(keywords_list) if keywords_list else article_data["keywords"]
-
-                    # Get authors
-                    authors_from_abstract = abstract_result.get("abstracts-retrieval-response", {}).get("authors", {}).get("author", [])
-                    processed_authors = []
-                    
-                    if not isinstance(authors_from_abstract, list):
-                        authors_from_abstract = [authors_from_abstract] if isinstance(authors_from_abstract, dict) else []
-
-                    for auth in authors_from_abstract:
-                        if isinstance(auth, dict):
-                            author_affiliation_objects = auth.get('affiliation', [])
-                            if not isinstance(author_affiliation_objects, list):
-                                author_affiliation_objects = [author_affiliation_objects] if isinstance(author_affiliation_objects, dict) else []
-
-                            author_affiliation_ids = [af_obj.get('@id') for af_obj in author_affiliation_objects if isinstance(af_obj, dict) and af_obj.get('@id')]
-                            
-                            processed_authors.append({
-                                "author_id": auth.get("@auid", ""),
-                                "preferred_name": auth.get("ce:indexed-name", ""),
-                                "initials": auth.get("ce:initials", ""),
-                                "surname": auth.get("ce:surname", ""),
-                                "orcid": auth.get("orcid", ""),
-                                "affiliation_ids": author_affiliation_ids
-                            })
-                    article_data["authors"] = processed_authors
-
-                    # Get affiliations
-                    affiliations_from_abstract = abstract_result.get("abstracts-retrieval-response", {}).get("affiliation", [])
-                    processed_affiliations = []
-
-                    if not isinstance(affiliations_from_abstract, list):
-                        affiliations_from_abstract = [affiliations_from_abstract] if isinstance(affiliations_from_abstract, dict) else []
-
-                    for affil in affiliations_from_abstract:
-                        if isinstance(affil, dict):
-                            country_val = affil.get("affiliation-country", "")
-                            
-                            processed_affiliations.append({
-                                "affiliation_id": affil.get("@id", ""),
-                                "institution_name": affil.get("affilname", ""),
-                                "country": country_val
-                            })
-                    article_data["affiliations"] = processed_affiliations
-
-                except requests.HTTPError as e:
-                    if e.response.status_code != 404:  # Don't spam 404s
-                        print(f"   Abstract HTTP error for {scopus_id}: {e.response.status_code}")
-                except json.JSONDecodeError as e:
-                    print(f"   Abstract JSON parsing error for {scopus_id}")
-                except Exception as e:
-                    print(f"   Abstract retrieval error for {scopus_id}: {e}")
-
-                articles_for_query.append(article_data)
-                batch_count += 1
-
-            print(f"   ✅ {year}: Processed {batch_count} articles in this batch")
+                abbrevs = dict.fromkeys(
+                    subj["@abbrev"] for subj in _as_list(subject_areas_raw)
+                    if isinstance(subj, dict) and subj.get("@abbrev"))
+                article_data["subject_area"] = ", ".join(abbrevs)
+
+                # Entries whose search-level description is already full and
+                # that carry author data don't need the abstract endpoint at
+                # all — for most corpora that drops the majority of the
+                # per-article round trips
+                has_people = merge_search_entry_details(entry, article_data)
+                if not (has_people and len(article_data["abstract"]) >= SKIP_ABSTRACT_MIN_DESCRIPTION):
+                    needs_abstract.append(article_data)
+
+                batch_articles.append(article_data)
+
+            # Abstract latency dominates the loop, so the whole page's
+            # abstract lookups run concurrently on the pool instead of one
+            # blocking GET plus a sleep per article; the pool size keeps
+            # aggregate request rate inside Scopus' quota
+            list(_abstract_pool.map(fetch_abstract_details, needs_abstract))
+
+            articles_for_query.extend(batch_articles)
+            _append_articles(output_file, batch_articles)
+            batch_count = len(batch_articles)
+
+            logger.info(f"   ✅ {year}: Processed {batch_count} articles in this batch")
             current_start += articles_per_request
 
             # Check if we should continue
             if len(articles_for_query) >= max_articles:
-                print(f"   🎯 {year}: Reached target ({max_articles} articles)")
+                logger.info(f"   🎯 {year}: Reached target ({max_articles} articles)")
                 break
 
-            time.sleep(1.5)  # Rate limiting
+            # No fixed inter-batch sleep: pacing emerges from the token bucket
 
         except requests.HTTPError as e:
-            print(f"   ❌ {year}: HTTP error {e.response.status_code}")
+            logger.warning(f"   ❌ {year}: HTTP error {e.response.status_code}")
             if e.response.status_code == 429:
-                print(f"   ⏱️  {year}: Rate limit hit. Waiting 60 seconds...")
-                time.sleep(60)
+                # Honor the server's own hint when present rather than a
+                # blanket 60s; jitter keeps the waiting year threads from
+                # all retrying at the same instant. current_start is
+                # untouched, so the same batch is retried, not dropped.
+                retry_after = e.response.headers.get('Retry-After', '')
+                delay = int(retry_after) if retry_after.isdigit() else 60
+                delay *= 1 + random.random() * 0.1
+                logger.warning(f"   ⏱️  {year}: Rate limit hit. Waiting {delay:.0f} seconds...")
+                time.sleep(delay)
             else:
                 break
         except Exception as e:
-            print(f"   ❌ {year}: Unexpected error: {e}")
+            logger.error(f"   ❌ {year}: Unexpected error: {e}")
             break
 
+    prefetch_pool.shutdown(wait=False)
     return articles_for_query
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    # Articles stream into per-year NDJSON shards as they are parsed; the
+    # combined file is rebuilt from the collected data for downstream
+    # loaders that expect a single dump
     extracted_data = extract_data_from_scopus_by_year(
         API_KEY, INST_TOKEN, SEARCH_ENDPOINT, ABSTRACT_ENDPOINT,
         domains, TARGET_YEARS, ARTICLES_PER_YEAR, ARTICLES_PER_SEARCH_REQUEST
     )
 
-    output_filename = "scopus_raw_data.json"
-    with open(output_filename, "w", encoding="utf-8") as f:
-        json.dump(extracted_data, f, indent=2)
+    with open(OUTPUT_FILENAME, "w", encoding="utf-8") as output_file:
+        _append_articles(output_file, extracted_data)
+
+    print(f"\n💾 Saved {len(extracted_data)} articles to {OUTPUT_FILENAME}")
 
-    print(f"\n💾 Saved {len(extracted_data)} articles to {output_filename}")
+    if write_parquet_dump(extracted_data):
+        print(f"💾 Also wrote columnar copy to {PARQUET_FILENAME}")
     
     # Final year distribution analysis
     print(f"\n📊 FINAL YEAR DISTRIBUTION ANALYSIS:")